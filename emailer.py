@@ -4,18 +4,28 @@ Email Sender - Send personalized emails to Product Hunt launches
 Uses Resend API to send emails based on CSV data and template
 """
 
+import asyncio
 import csv
+import hashlib
+import io
+import json
+import mmap
 import os
+import re
 import sys
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Iterable
 
 try:
-    import resend
+    import httpx
 except ImportError:
-    print("❌ Please install resend: pip3 install resend")
+    print("❌ Please install httpx: pip3 install 'httpx[http2]'")
     sys.exit(1)
 
 try:
@@ -31,12 +41,109 @@ FROM_EMAIL = os.getenv("FROM_EMAIL", "")
 TEST_EMAIL_DEFAULT = os.getenv("TEST_EMAIL", "")
 TEMPLATE_FILE = "template.txt"
 
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
+BATCH_SIZE = 100  # Resend accepts up to 100 emails per batch call
+MAX_CONCURRENT_SENDS = 10
+MAX_SEND_ATTEMPTS = 5  # Per batch, when Resend answers 429 Too Many Requests
+MMAP_MIN_SIZE = 8 << 20  # Smaller CSVs are faster to read through plain buffered I/O
+
+# Bytes that can precede the '@' of an email address
+_LOCAL_PART_BYTES = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+
+# Map source to friendly name (read-only, built once at import)
+_PLATFORM_NAMES = MappingProxyType({
+    'producthunt': 'Product Hunt',
+    'hackernews': 'Hacker News',
+    'indiehackers': 'Indie Hackers'
+})
+
+# Template placeholders and the render() argument each one maps to
+_PLACEHOLDER_RE = re.compile(r"\{\{(FirstName|ProductName|LaunchPlatform)\}\}")
+_PLACEHOLDER_ARGS = {
+    'FirstName': 'first_name',
+    'ProductName': 'product_name',
+    'LaunchPlatform': 'launch_platform'
+}
+
+# Addresses Resend will accept; anything else would get its whole batch rejected
+_ADDRESS_RE = re.compile(r"[A-Za-z0-9._+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+
+# Placeholder/invalid emails that should never be contacted
+_INVALID_RE = re.compile(
+    r"example\.com|your@|you@|noreply@|no-reply@|test@|demo@|\.webp|footer\.email",
+    re.IGNORECASE
+)
+
 if not RESEND_API_KEY or not FROM_EMAIL:
     print("❌ Missing RESEND_API_KEY or FROM_EMAIL in .env file")
     print("   Copy .env.example to .env and fill in your credentials")
     sys.exit(1)
 
 
+@dataclass
+class Outbox:
+    """Emails waiting to be sent, stored column-wise (one list per field)"""
+    indices: list[int] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    makers: list[str] = field(default_factory=list)
+    sources: list[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.indices)
+    
+    def add(self, row_index: int, email: str, name: str, maker: str, source: str):
+        self.indices.append(row_index)
+        self.emails.append(email)
+        self.names.append(name)
+        self.makers.append(maker)
+        self.sources.append(source)
+
+
+class RateLimit:
+    """
+    Paces Resend API requests using the rate-limit headers on each response,
+    so requests only wait when the current window is actually used up
+    """
+    
+    def __init__(self):
+        self.limit = 1  # Requests per window, learned from the first response
+        self.remaining = 1
+        self.reset_at = 0.0  # time.monotonic() when the current window ends
+    
+    async def acquire(self):
+        """Wait until another request may be sent"""
+        while self.remaining <= 0:
+            delay = self.reset_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # New window; assume 1 second until a response says otherwise
+                self.remaining = self.limit
+                self.reset_at = time.monotonic() + 1
+        self.remaining -= 1
+    
+    def update(self, response: httpx.Response):
+        """Record the limits reported by a response"""
+        headers = response.headers
+        now = time.monotonic()
+        
+        try:
+            self.limit = int(headers['ratelimit-limit'])
+            # Other requests may be in flight, so never raise the local budget
+            self.remaining = min(self.remaining, int(headers['ratelimit-remaining']))
+            self.reset_at = now + float(headers['ratelimit-reset'])
+        except (KeyError, ValueError):
+            pass
+        
+        if response.status_code == 429:
+            self.remaining = 0
+            try:
+                self.reset_at = now + float(headers.get('retry-after', 1))
+            except ValueError:
+                self.reset_at = now + 1
+
+
 def validate_test_email(test_email: str) -> bool:
     """Validate that test email is configured when running in test mode"""
     if not test_email:
@@ -46,10 +153,34 @@ def validate_test_email(test_email: str) -> bool:
     return True
 
 
-def load_template(template_path: str) -> str:
-    """Load email template from file"""
+def compile_template(raw: str) -> Callable[[str, str, str], str]:
+    """
+    Turn a template into a render(first_name, product_name, launch_platform)
+    function that builds the body with a single string concatenation
+    """
+    parts = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(raw):
+        if match.start() > pos:
+            parts.append(repr(raw[pos:match.start()]))
+        parts.append(_PLACEHOLDER_ARGS[match.group(1)])
+        pos = match.end()
+    if pos < len(raw):
+        parts.append(repr(raw[pos:]))
+    
+    src = (
+        "def render(first_name, product_name, launch_platform):\n"
+        f"    return {' + '.join(parts) or repr('')}\n"
+    )
+    namespace = {}
+    exec(compile(src, TEMPLATE_FILE, 'exec'), namespace)
+    return namespace['render']
+
+
+def load_template(template_path: str) -> Callable[[str, str, str], str]:
+    """Load email template from file and compile it into a render function"""
     with open(template_path, 'r', encoding='utf-8') as f:
-        return f.read()
+        return compile_template(f.read())
 
 
 def extract_first_name(maker_name: str) -> str:
@@ -57,34 +188,21 @@ def extract_first_name(maker_name: str) -> str:
     if not maker_name:
         return "there"  # Fallback if no name
     
-    # Split by space and take first part
-    parts = maker_name.strip().split()
-    if parts:
-        return parts[0]
-    return "there"
+    # Split off only the first word (any whitespace), not the whole name
+    parts = maker_name.split(None, 1)
+    return parts[0] if parts else "there"
 
 
-def personalize_email(template: str, product: dict) -> tuple[str, str]:
+def personalize_email(template: Callable[[str, str, str], str], maker_name: str, product_name: str, source: str) -> tuple[str, str]:
     """
     Replace placeholders in template with actual values
     Returns (subject, body)
     """
-    first_name = extract_first_name(product.get('maker_name', ''))
-    product_name = product.get('name', 'your product')
-    launch_platform = product.get('source', 'Product Hunt')
-    
-    # Map source to friendly name
-    platform_names = {
-        'producthunt': 'Product Hunt',
-        'hackernews': 'Hacker News',
-        'indiehackers': 'Indie Hackers'
-    }
-    launch_platform = platform_names.get(launch_platform.lower(), launch_platform)
+    first_name = extract_first_name(maker_name)
+    launch_platform = _PLATFORM_NAMES.get(source.lower(), source)
     
-    # Replace placeholders in body
-    body = template.replace('{{FirstName}}', first_name)
-    body = body.replace('{{ProductName}}', product_name)
-    body = body.replace('{{LaunchPlatform}}', launch_platform)
+    # Fill in placeholders with the precompiled render function
+    body = template(first_name, product_name, launch_platform)
     
     # Create subject
     subject = f"Congrats on launching {product_name}!"
@@ -92,44 +210,311 @@ def personalize_email(template: str, product: dict) -> tuple[str, str]:
     return subject, body
 
 
-def send_email(to_email: str, subject: str, body: str, test_mode: bool = False, test_email: str = None) -> tuple[bool, str]:
+def _make_client() -> httpx.AsyncClient:
     """
-    Send email using Resend API
-    Returns (success, message)
+    Create the HTTP client shared by every Resend request in a run
+    Idle connections are kept alive long enough to survive the gaps between
+    rate-limited requests, so the TCP + TLS handshake is paid once
     """
-    resend.api_key = RESEND_API_KEY
-    
-    # In test mode, send to test email instead
-    actual_recipient = test_email if test_mode else to_email
-    
-    try:
-        params = {
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"Authorization": f"Bearer {RESEND_API_KEY}"},
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60),
+        timeout=30
+    )
+
+
+async def send_batch(client: httpx.AsyncClient, rate_limit: RateLimit, messages: list[tuple[str, str, str]],
+                     test_mode: bool = False, test_email: str = None) -> list[tuple[bool, str]]:
+    """
+    Send up to BATCH_SIZE emails in a single Resend batch API call
+    messages is a list of (to_email, subject, body)
+    Returns one (success, message) per email, in the same order
+    """
+    params = [
+        {
             "from": FROM_EMAIL,
-            "to": [actual_recipient],
+            # In test mode, send to test email instead
+            "to": [test_email if test_mode else to_email],
             "subject": subject,
             "text": body,
         }
+        for to_email, subject, body in messages
+    ]
+    
+    # Keyed by the exact request body: resending the same batch after a dropped
+    # connection is answered by Resend instead of sent again, while any change in
+    # recipients, subject or body makes a new request
+    payload = json.dumps(params, sort_keys=True)
+    headers = {"Idempotency-Key": hashlib.sha256(payload.encode('utf-8')).hexdigest()}
+    
+    try:
+        for attempt in range(MAX_SEND_ATTEMPTS):
+            await rate_limit.acquire()
+            response = await client.post(RESEND_BATCH_URL, json=params, headers=headers)
+            rate_limit.update(response)
+            
+            # On 429 the next acquire() waits out Retry-After before retrying
+            if response.status_code != 429:
+                break
         
-        response = resend.Emails.send(params)
+        data = response.json()
         
-        if response and response.get('id'):
-            return True, f"Sent (ID: {response['id']})"
+        results = data.get('data') if response.is_success else None
+        if results and len(results) == len(messages):
+            return [(True, f"Sent (ID: {result['id']})") for result in results]
         else:
-            return False, f"Failed: {response}"
+            # The batch is accepted or rejected as a whole
+            return [(False, f"Failed: {data}")] * len(messages)
             
     except Exception as e:
-        return False, f"Error: {str(e)}"
+        return [(False, f"Error: {str(e)}")] * len(messages)
 
 
-def process_csv(csv_path: str, limit: int = None, test_mode: bool = False, test_email: str = None):
+def _cell(row: list, col: int, default: str = '') -> str:
+    """Return a csv.reader cell, or default if the column or cell is missing"""
+    if col is None or col >= len(row):
+        return default
+    return row[col]
+
+
+def _has_email_hint(mm: mmap.mmap, start: int, end: int) -> bool:
     """
-    Process CSV file and send emails
+    Check whether mm[start:end] has an '@' right after a local-part character
+    (Product Hunt profile URLs contain "/@" and must not count)
+    """
+    at = mm.find(b'@', start, end)
+    while at != -1:
+        if at > start and mm[at - 1] in _LOCAL_PART_BYTES:
+            return True
+        at = mm.find(b'@', at + 1, end)
+    return False
+
+
+def _iter_csv(csv_path: str):
+    """
+    Yield the parsed rows of a CSV file, header first
     
-    Args:
-        csv_path: Path to CSV file
-        limit: Maximum number of emails to send
-        test_mode: If True, send all emails to test_email instead
-        test_email: Email address for testing
+    Files over MMAP_MIN_SIZE are memory-mapped and pre-scanned as bytes: a row
+    with nothing email-like in it is yielded as None without being decoded or
+    parsed
+    """
+    if os.path.getsize(csv_path) <= MMAP_MIN_SIZE:
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            yield from csv.reader(f)
+        return
+    
+    with open(csv_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        is_header = True
+        in_quotes = False
+        start = 0
+        
+        while True:
+            line = mm.readline()
+            if not line:
+                break
+            
+            # An odd number of quotes means a quoted field continues on the next line
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes:
+                continue
+            
+            end = mm.tell()
+            if is_header or _has_email_hint(mm, start, end):
+                yield next(csv.reader([mm[start:end].decode('utf-8')]), [])
+                is_header = False
+            else:
+                yield None
+            start = end
+        
+        # Unterminated quoted field at end of file
+        if start < len(mm):
+            yield next(csv.reader([mm[start:].decode('utf-8')]), [])
+
+
+def _status_header(header: list) -> tuple[list, int, int]:
+    """
+    Add email_sent and email_sent_at columns to a header if not present
+    Returns (header, email_sent_col, email_sent_at_col)
+    """
+    for column in ('email_sent', 'email_sent_at'):
+        if column not in header:
+            header.append(column)
+    return header, header.index('email_sent'), header.index('email_sent_at')
+
+
+def _write_rows(path: str, rows: Iterable[list]):
+    """
+    Write already-normalized CSV rows to path in a single writerows call,
+    through one large buffer, then fsync
+    A partially written file is removed if writing fails
+    """
+    try:
+        with open(path, 'wb', buffering=0) as raw, \
+                io.BufferedWriter(raw, buffer_size=1 << 20) as buf, \
+                io.TextIOWrapper(buf, encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows(rows)
+            
+            f.flush()
+            os.fsync(raw.fileno())
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def save_statuses(csv_path: str, statuses: dict):
+    """
+    Rewrite the CSV in one streaming pass, filling in email_sent/email_sent_at
+    for every row in statuses ({row_index: (status, timestamp)})
+    
+    The output goes to a temp file that then replaces the original, so the
+    original CSV stays intact if anything fails
+    """
+    tmp_path = f"{csv_path}.tmp"
+    
+    with open(csv_path, 'r', newline='', encoding='utf-8') as src:
+        reader = csv.reader(src)
+        header, sent_col, sent_at_col = _status_header(next(reader, []))
+        
+        def rows():
+            yield header
+            for i, row in enumerate(reader):
+                if len(row) < len(header):
+                    row.extend([''] * (len(header) - len(row)))
+                if i in statuses:
+                    row[sent_col], row[sent_at_col] = statuses[i]
+                yield row
+        
+        _write_rows(tmp_path, rows())
+    
+    os.replace(tmp_path, csv_path)
+
+
+def save_products(csv_path: str, products: list[dict], fieldnames: list, statuses: dict):
+    """
+    Write in-memory products to the CSV along with their send statuses
+    ({row_index: (status, timestamp)}), replacing the file atomically
+    """
+    tmp_path = f"{csv_path}.tmp"
+    header, sent_col, sent_at_col = _status_header(list(fieldnames))
+    
+    def rows():
+        yield header
+        for i, product in enumerate(products):
+            row = [product.get(name, '') for name in header]
+            if i in statuses:
+                row[sent_col], row[sent_at_col] = statuses[i]
+            yield row
+    
+    _write_rows(tmp_path, rows())
+    os.replace(tmp_path, csv_path)
+
+
+def load_journal(journal_path: str) -> dict:
+    """
+    Read send results journaled by a previous, interrupted run
+    Returns {row_index: (status, timestamp)}
+    """
+    entries = {}
+    if not os.path.exists(journal_path):
+        return entries
+    
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial last line if the run was killed mid-write
+            entries[entry['i']] = (entry['s'], entry['t'])
+    
+    return entries
+
+
+def _append_journal(journal, lines: list[str]):
+    """Append result lines to the journal and fsync them once (runs in a worker thread)"""
+    journal.writelines(lines)
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+async def _run(client: httpx.AsyncClient, rate_limit: RateLimit, outbox: Outbox, template: Callable,
+               journal, statuses: dict, test_mode: bool, test_email: str,
+               offset: int = 0, total: int = None) -> tuple[int, int]:
+    """
+    Send all emails in concurrent batches and record results as they finish
+    Each result is appended to the journal; the CSV itself is written by the caller
+    offset/total only affect the progress numbers that are printed
+    Returns (sent_count, failed_count)
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+    loop = asyncio.get_running_loop()
+    
+    emails = outbox.emails
+    names = outbox.names
+    makers = outbox.makers
+    sources = outbox.sources
+    count = len(outbox)
+    
+    sent_count = 0
+    failed_count = 0
+    done = offset
+    
+    async def send_chunk(start: int, end: int):
+        # Personalize the whole chunk before submitting it
+        messages = []
+        for k in range(start, end):
+            subject, body = personalize_email(template, makers[k], names[k], sources[k])
+            messages.append((emails[k], subject, body))
+        
+        async with sem:
+            results = await send_batch(client, rate_limit, messages, test_mode, test_email)
+        return start, end, results
+    
+    tasks = [send_chunk(start, min(start + BATCH_SIZE, count))
+             for start in range(0, count, BATCH_SIZE)]
+    
+    # Journal writes + fsync happen on a single worker thread (which keeps them in
+    # order) so disk flushes don't stall the event loop while batches are in flight
+    with ThreadPoolExecutor(max_workers=1) as journal_writer:
+        for task in asyncio.as_completed(tasks):
+            start, end, results = await task
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            lines = []
+            
+            for k, (success, message) in zip(range(start, end), results):
+                done += 1
+                row_index = outbox.indices[k]
+                
+                print(f"\n[{done}/{total}] {names[k]}" if total else f"\n[{done}] {names[k]}")
+                print(f"    Maker: {makers[k]}")
+                print(f"    Email: {emails[k]}" + (f" → {test_email}" if test_mode else ""))
+                
+                if success:
+                    print(f"    ✅ {message}")
+                    status = 'sent'
+                    sent_count += 1
+                else:
+                    print(f"    ❌ {message}")
+                    status = 'failed'
+                    failed_count += 1
+                
+                statuses[row_index] = (status, timestamp)
+                
+                # Journal each result to prevent duplicates if interrupted
+                lines.append(json.dumps({"i": row_index, "s": status, "t": timestamp}) + "\n")
+            
+            # Make the batch durable with one flush + fsync instead of one per row
+            await loop.run_in_executor(journal_writer, _append_journal, journal, lines)
+    
+    return sent_count, failed_count
+
+
+def _prepare_send(test_mode: bool, test_email: str) -> tuple[Callable, str]:
+    """
+    Validate test mode settings and load the template, exiting on errors
+    Returns (template, actual_test_email)
     """
     # Validate test email in test mode
     actual_test_email = test_email or TEST_EMAIL_DEFAULT
@@ -147,100 +532,180 @@ def process_csv(csv_path: str, limit: int = None, test_mode: bool = False, test_
     template = load_template(str(template_path))
     print(f"✅ Loaded template from {template_path}")
     
-    # Read CSV
-    rows = []
-    fieldnames = []
+    return template, actual_test_email
+
+
+def _queue_email(outbox: Outbox, skipped: list, row_index: int, email: str, email_sent: str,
+                 name: str, maker: str, source: str):
+    """
+    Add a product to the outbox unless it has no email or was already sent
+    Rows with placeholder or malformed emails go to skipped instead
+    """
+    email = email.strip()
+    
+    # Skip if no email or already sent
+    if not email:
+        return
+    if email_sent == 'sent':
+        return
+    
+    # Skip placeholder/invalid emails, and anything that would make Resend reject the batch
+    if not _ADDRESS_RE.fullmatch(email) or _INVALID_RE.search(email):
+        skipped.append(row_index)
+        return
+    
+    outbox.add(row_index, email, name, maker, source)
+
+
+def _mark_skipped(statuses: dict, skipped: list):
+    """Record 'skipped' for invalid-email rows that have no other result yet"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for row_index in skipped:
+        statuses.setdefault(row_index, ('skipped', timestamp))
+
+
+def process_csv(csv_path: str, limit: int = None, test_mode: bool = False, test_email: str = None):
+    """
+    Process CSV file and send emails
+    
+    Args:
+        csv_path: Path to CSV file
+        limit: Maximum number of emails to send
+        test_mode: If True, send all emails to test_email instead
+        test_email: Email address for testing
+    """
+    template, actual_test_email = _prepare_send(test_mode, test_email)
     
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames or []
-        rows = list(reader)
+    # Replay results from an interrupted run so they are not sent twice
+    journal_path = f"{csv_path}.journal"
+    statuses = load_journal(journal_path)
+    if statuses:
+        print(f"♻️  Recovered {len(statuses)} results from {journal_path}")
     
-    print(f"📊 Found {len(rows)} products in CSV")
+    # Stream the CSV, keeping only the fields of rows we intend to send
+    outbox = Outbox()
+    skipped = []
+    total = 0
     
-    # Add email_sent and email_sent_at columns if not present
-    if 'email_sent' not in fieldnames:
-        fieldnames.append('email_sent')
-    if 'email_sent_at' not in fieldnames:
-        fieldnames.append('email_sent_at')
+    reader = _iter_csv(csv_path)
+    header = next(reader, None) or []
+    idx = {name: i for i, name in enumerate(header)}
+    email_col = idx.get('email')
+    email_sent_col = idx.get('email_sent')
+    name_col = idx.get('name')
+    maker_col = idx.get('maker_name')
+    source_col = idx.get('source')
     
-    # Filter products with valid emails that haven't been sent yet
-    to_send = []
-    for i, row in enumerate(rows):
-        email = row.get('email', '').strip()
-        email_sent = row.get('email_sent', '').strip().lower()
-        
-        # Skip if no email or already sent
-        if not email:
-            continue
-        if email_sent == 'sent':
+    for i, row in enumerate(reader):
+        total += 1
+        # Rows the byte-level pre-scan ruled out have no email
+        if row is None:
             continue
         
-        # Skip placeholder/invalid emails
-        invalid_patterns = ['example.com', 'your@', 'you@', 'noreply@', 'no-reply@', 
-                          'test@', 'demo@', '.webp', 'footer.email']
-        if any(p in email.lower() for p in invalid_patterns):
-            rows[i]['email_sent'] = 'skipped'
-            rows[i]['email_sent_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            continue
-            
-        to_send.append((i, row))
+        if i in statuses:
+            email_sent = statuses[i][0]
+        else:
+            email_sent = _cell(row, email_sent_col).strip().lower()
+        
+        _queue_email(
+            outbox, skipped, i,
+            _cell(row, email_col),
+            email_sent,
+            _cell(row, name_col, 'your product'),
+            _cell(row, maker_col),
+            _cell(row, source_col, 'Product Hunt')
+        )
+        
+        # No need to look further once the limit is reached
+        if limit and len(outbox) >= limit:
+            break
+    
+    if limit and len(outbox) >= limit:
+        print(f"📊 Scanned {total} products in CSV, stopping at the {limit}-email limit")
+    else:
+        print(f"📊 Found {total} products in CSV")
     
-    print(f"📧 Found {len(to_send)} products with valid emails to send")
+    _send_outbox(outbox, skipped, template, statuses, csv_path,
+                 lambda: save_statuses(csv_path, statuses), test_mode, actual_test_email)
+
+
+def process_products(products: list[dict], csv_path: str, fieldnames: list, limit: int = None,
+                     test_mode: bool = False, test_email: str = None):
+    """
+    Send emails for products that are already in memory, e.g. straight from the scraper
+    The CSV is never read back; it is written once at the end, with send statuses
     
-    if limit and limit < len(to_send):
+    Args:
+        products: Product dicts, in CSV row order
+        csv_path: Path to CSV file to write
+        fieldnames: CSV columns to write for each product
+        limit: Maximum number of emails to send
+        test_mode: If True, send all emails to test_email instead
+        test_email: Email address for testing
+    """
+    template, actual_test_email = _prepare_send(test_mode, test_email)
+    
+    statuses = {}
+    outbox = Outbox()
+    skipped = []
+    
+    for i, product in enumerate(products):
+        _queue_email(
+            outbox, skipped, i,
+            product.get('email', ''),
+            product.get('email_sent', '').strip().lower(),
+            product.get('name', 'your product'),
+            product.get('maker_name', ''),
+            product.get('source', 'Product Hunt')
+        )
+        
+        # No need to look further once the limit is reached
+        if limit and len(outbox) >= limit:
+            break
+    
+    print(f"📊 Found {len(products)} products")
+    if limit and len(outbox) >= limit:
         print(f"⚠️  Limiting to first {limit} emails")
-        to_send = to_send[:limit]
+    
+    # Fresh products: any journal left over refers to an older scrape
+    journal_path = f"{csv_path}.journal"
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+    
+    _send_outbox(outbox, skipped, template, statuses, csv_path,
+                 lambda: save_products(csv_path, products, fieldnames, statuses),
+                 test_mode, actual_test_email)
+
+
+def _send_outbox(outbox: Outbox, skipped: list, template: Callable, statuses: dict, csv_path: str,
+                 save: Callable[[], None], test_mode: bool, test_email: str):
+    """
+    Send everything in the outbox, journaling results next to csv_path,
+    then mark skipped rows and call save() to write the CSV once and drop the journal
+    """
+    print(f"📧 Found {len(outbox)} products with valid emails to send")
     
     if test_mode:
-        print(f"🧪 TEST MODE: All emails will be sent to {actual_test_email}")
+        print(f"🧪 TEST MODE: All emails will be sent to {test_email}")
     
     # Send emails
-    sent_count = 0
-    failed_count = 0
+    print(f"🚀 Sending in batches of up to {BATCH_SIZE}, paced by Resend's rate-limit headers")
     
-    for idx, (row_index, product) in enumerate(to_send):
-        email = product.get('email', '')
-        name = product.get('name', 'Unknown')
-        maker = product.get('maker_name', 'Unknown')
-        
-        print(f"\n[{idx + 1}/{len(to_send)}] {name}")
-        print(f"    Maker: {maker}")
-        print(f"    Email: {email}" + (f" → {actual_test_email}" if test_mode else ""))
-        
-        # Personalize email
-        subject, body = personalize_email(template, product)
-        
-        # Send email
-        success, message = send_email(email, subject, body, test_mode, actual_test_email)
-        
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        if success:
-            print(f"    ✅ {message}")
-            rows[row_index]['email_sent'] = 'sent'
-            rows[row_index]['email_sent_at'] = timestamp
-            sent_count += 1
-        else:
-            print(f"    ❌ {message}")
-            rows[row_index]['email_sent'] = 'failed'
-            rows[row_index]['email_sent_at'] = timestamp
-            failed_count += 1
-        
-        # Save CSV after each email to prevent duplicates if interrupted
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in rows:
-                for field in fieldnames:
-                    if field not in row:
-                        row[field] = ''
-                writer.writerow(row)
-        
-        # Add delay between emails (except for the last one)
-        if idx < len(to_send) - 1:
-            print(f"    ⏳ Waiting 5 seconds...")
-            time.sleep(5)
+    async def send_all():
+        async with _make_client() as client:
+            return await _run(client, RateLimit(), outbox, template, journal, statuses,
+                              test_mode, test_email, total=len(outbox))
+    
+    journal_path = f"{csv_path}.journal"
+    journal = open(journal_path, 'a', encoding='utf-8')
+    try:
+        sent_count, failed_count = asyncio.run(send_all())
+    finally:
+        journal.close()
+        # Reconcile all results into the CSV once, then drop the journal
+        _mark_skipped(statuses, skipped)
+        save()
+        os.remove(journal_path)
     
     print(f"\n{'=' * 50}")
     print(f"✅ Done!")
@@ -249,6 +714,97 @@ def process_csv(csv_path: str, limit: int = None, test_mode: bool = False, test_
     print(f"   📝 CSV updated: {csv_path}")
 
 
+async def process_queue(queue: asyncio.Queue, csv_path: str, fieldnames: list, limit: int = None,
+                        test_mode: bool = False, test_email: str = None) -> tuple[int, int]:
+    """
+    Send emails for products as they arrive on a queue, while they are still being scraped
+    
+    Args:
+        queue: Product dicts, followed by None once scraping is done
+        csv_path: CSV file to create; products are appended to csv_path.partial as they
+            arrive, which replaces csv_path at the end only if any product came in
+        fieldnames: CSV columns to write for each product
+        limit: Maximum number of emails to send
+        test_mode: If True, send all emails to test_email instead
+        test_email: Email address for testing
+    
+    Returns (sent_count, failed_count)
+    """
+    template, actual_test_email = _prepare_send(test_mode, test_email)
+    
+    if test_mode:
+        print(f"🧪 TEST MODE: All emails will be sent to {actual_test_email}")
+    
+    statuses = {}
+    skipped = []
+    sent_count = 0
+    failed_count = 0
+    queued = 0
+    row_index = 0
+    finished = False
+    
+    # An earlier CSV, its email_sent statuses and any journal left next to it
+    # stay until this scrape has produced something; results for the new rows
+    # are journaled next to the partial file they index into
+    partial_path = f"{csv_path}.partial"
+    journal_path = f"{partial_path}.journal"
+    f = open(partial_path, 'w', newline='', encoding='utf-8')
+    journal = open(journal_path, 'w', encoding='utf-8')
+    try:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        
+        async with _make_client() as client:
+            rate_limit = RateLimit()
+            
+            while not finished:
+                # Wait for one product, then take everything else already scraped as one batch
+                products = [await queue.get()]
+                while len(products) < BATCH_SIZE and not queue.empty():
+                    products.append(queue.get_nowait())
+                if None in products:
+                    finished = True
+                    products = products[:products.index(None)]
+                
+                outbox = Outbox()
+                for product in products:
+                    writer.writerow([product.get(name, '') for name in fieldnames])
+                    if not limit or queued + len(outbox) < limit:
+                        _queue_email(
+                            outbox, skipped, row_index,
+                            product.get('email', ''),
+                            '',
+                            product.get('name', 'your product'),
+                            product.get('maker_name', ''),
+                            product.get('source', 'Product Hunt')
+                        )
+                    row_index += 1
+                f.flush()
+                
+                if outbox:
+                    sent, failed = await _run(client, rate_limit, outbox, template, journal, statuses,
+                                              test_mode, actual_test_email, offset=queued)
+                    queued += len(outbox)
+                    sent_count += sent
+                    failed_count += failed
+    finally:
+        f.close()
+        journal.close()
+        if row_index:
+            os.replace(partial_path, csv_path)
+            # The old CSV is gone, so its leftover journal no longer applies
+            if os.path.exists(f"{csv_path}.journal"):
+                os.remove(f"{csv_path}.journal")
+            # Reconcile all results into the CSV once, then drop the journal
+            _mark_skipped(statuses, skipped)
+            save_statuses(csv_path, statuses)
+        else:
+            os.remove(partial_path)
+        os.remove(journal_path)
+    
+    return sent_count, failed_count
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Send personalized emails to Product Hunt launches',
@@ -4,6 +4,7 @@ Master Script - Orchestrates scraping and emailing workflow
 Runs scraper, shows stats, then sends emails with user confirmation
 """
 
+import asyncio
 import os
 import sys
 import argparse
@@ -17,8 +18,8 @@ except ImportError:
     pass  # dotenv is optional for scrape-only mode
 
 # Import from local modules
-from scraper import scrape_producthunt, save_to_csv
-from emailer import process_csv
+from scraper import iter_producthunt, product_to_dict, ProductWriter, ParquetBatches, CSV_FIELDNAMES
+from emailer import process_csv, process_products, process_queue, BATCH_SIZE
 
 # Get test email from environment
 TEST_EMAIL_DEFAULT = os.getenv("TEST_EMAIL", "")
@@ -40,12 +41,26 @@ def print_section(title: str):
     print('=' * 60)
 
 
-def run_scraper(limit: int = None) -> tuple[Path, dict]:
+def get_stats(products: list) -> dict:
+    """Calculate scraper stats for a list of products"""
+    return {
+        'total': len(products),
+        'with_email': sum(1 for p in products if p.email),
+        'with_maker': sum(1 for p in products if p.maker_name),
+        'with_twitter': sum(1 for p in products if p.twitter),
+        'with_linkedin': sum(1 for p in products if p.linkedin),
+    }
+
+
+def run_scraper(limit: int = None, cdp_endpoint: str = None, headed: bool = False,
+                parquet: bool = False) -> tuple[Path, dict, list]:
     """
-    Run the scraper and return CSV path and stats
+    Run the scraper and return CSV path, stats and the scraped products
+    
+    Each product is written to the CSV as soon as it is scraped
     
     Returns:
-        (csv_path, stats_dict)
+        (csv_path, stats_dict, products)
     """
     print_section("🔍 STEP 1: SCRAPING PRODUCT HUNT")
     
@@ -54,25 +69,18 @@ def run_scraper(limit: int = None) -> tuple[Path, dict]:
     
     print("\n📥 Scraping ProductHunt...")
     
+    products = []
+    
+    async def scrape(writer: ProductWriter):
+        async for product in iter_producthunt(limit=limit, cdp_endpoint=cdp_endpoint, headed=headed):
+            writer.write(product)
+            products.append(product)
+    
     try:
-        products = scrape_producthunt(limit=limit)
-        
-        # Calculate stats
-        stats = {
-            'total': len(products),
-            'with_email': sum(1 for p in products if p.email),
-            'with_maker': sum(1 for p in products if p.maker_name),
-            'with_twitter': sum(1 for p in products if p.twitter),
-            'with_linkedin': sum(1 for p in products if p.linkedin),
-        }
+        with ProductWriter(get_csv_path().name, parquet) as writer:
+            asyncio.run(scrape(writer))
         
-        # Save to CSV
-        print("\n💾 Saving results...")
-        save_to_csv(products)
-        
-        csv_path = get_csv_path()
-        
-        return csv_path, stats
+        return writer.filepath, get_stats(products), products
         
     except Exception as e:
         print(f"\n❌ Scraping failed: {e}")
@@ -92,10 +100,14 @@ def print_scraper_stats(stats: dict):
     """)
 
 
-def run_emailer(csv_path: Path, limit: int = None, test_mode: bool = False, test_email: str = None) -> dict:
+def run_emailer(csv_path: Path, limit: int = None, test_mode: bool = False, test_email: str = None,
+                products: list = None) -> dict:
     """
     Run the emailer and return stats
     
+    When products from this run's scrape are given they are emailed straight
+    from memory; otherwise the CSV at csv_path is read
+    
     Returns:
         stats_dict with sent, failed counts
     """
@@ -108,12 +120,91 @@ def run_emailer(csv_path: Path, limit: int = None, test_mode: bool = False, test
         print(f"⚠️  Limiting to {limit} emails")
     
     # Run emailer
-    process_csv(
-        csv_path=str(csv_path),
-        limit=limit,
-        test_mode=test_mode,
-        test_email=test_email
-    )
+    if products is not None:
+        process_products(
+            products=[product_to_dict(p) for p in products],
+            csv_path=str(csv_path),
+            fieldnames=CSV_FIELDNAMES,
+            limit=limit,
+            test_mode=test_mode,
+            test_email=test_email
+        )
+    else:
+        process_csv(
+            csv_path=str(csv_path),
+            limit=limit,
+            test_mode=test_mode,
+            test_email=test_email
+        )
+
+
+async def pipeline(csv_path: Path, scrape_limit: int = None, email_limit: int = None,
+                   test_mode: bool = False, test_email: str = None, cdp_endpoint: str = None,
+                   headed: bool = False, parquet: bool = False) -> list:
+    """
+    Scrape and send at the same time: each product is handed to the emailer
+    through a queue as soon as the scraper is done with it
+    
+    With parquet, each product is also added to a Parquet file next to the CSV
+    
+    Returns the scraped products
+    """
+    queue = asyncio.Queue()
+    products = []
+    parquet_rows = ParquetBatches(csv_path.with_suffix(".parquet")) if parquet else None
+    
+    async def produce():
+        try:
+            async for product in iter_producthunt(limit=scrape_limit, cdp_endpoint=cdp_endpoint, headed=headed):
+                products.append(product)
+                row = product_to_dict(product)
+                queue.put_nowait(row)
+                if parquet_rows:
+                    parquet_rows.append(tuple(row.values()))
+        finally:
+            # Always let the emailer finish, even if scraping fails
+            queue.put_nowait(None)
+    
+    complete = False
+    try:
+        await asyncio.gather(
+            produce(),
+            process_queue(queue, str(csv_path), CSV_FIELDNAMES, email_limit, test_mode, test_email)
+        )
+        complete = True
+    finally:
+        if parquet_rows:
+            parquet_rows.close(complete)
+    
+    return products
+
+
+def run_pipeline(csv_path: Path, scrape_limit: int = None, email_limit: int = None,
+                 test_mode: bool = False, test_email: str = None, cdp_endpoint: str = None,
+                 headed: bool = False, parquet: bool = False) -> dict:
+    """
+    Run scraper and emailer together and return scraper stats
+    
+    Returns:
+        stats_dict
+    """
+    print_section("🔍📧 SCRAPING PRODUCT HUNT & SENDING EMAILS")
+    
+    if scrape_limit:
+        print(f"\n⚠️  Limiting to first {scrape_limit} products")
+    if email_limit:
+        print(f"⚠️  Limiting to {email_limit} emails")
+    
+    csv_path.parent.mkdir(exist_ok=True)
+    
+    try:
+        products = asyncio.run(pipeline(csv_path, scrape_limit, email_limit, test_mode, test_email, cdp_endpoint,
+                                        headed, parquet))
+    except Exception as e:
+        print(f"\n❌ Pipeline failed: {e}")
+        sys.exit(1)
+    
+    return get_stats(products)
 
 
 def print_final_summary(scraper_stats: dict, csv_path: Path):
@@ -153,6 +244,9 @@ Examples:
 
   # Use specific date's CSV for emailing
   python3 run.py --email-only --date 2026-01-08
+
+  # Send each email as soon as its product is scraped
+  python3 run.py --pipeline --email-limit 20
         """
     )
     
@@ -162,6 +256,12 @@ Examples:
                                help='Limit number of products to scrape')
     scraper_group.add_argument('--scrape-only', action='store_true',
                                help='Only run scraper, skip emailing')
+    scraper_group.add_argument('--cdp-endpoint', default=None,
+                               help='Scrape with a running Chromium at this CDP URL instead of launching one')
+    scraper_group.add_argument('--headed', action='store_true',
+                               help='Show the browser window while scraping')
+    scraper_group.add_argument('--parquet', action='store_true',
+                               help='Also write a Parquet file next to the CSV (needs pyarrow)')
     
     # Emailer options
     emailer_group = parser.add_argument_group('Emailer Options')
@@ -175,6 +275,8 @@ Examples:
                                help='Test email address (uses TEST_EMAIL from .env if not specified)')
     emailer_group.add_argument('--no-confirm', action='store_true',
                                help='Skip confirmation before sending emails')
+    emailer_group.add_argument('--pipeline', action='store_true',
+                               help='Send emails while scraping instead of after (confirms up front)')
     
     # General options
     parser.add_argument('--date', type=str, default=None,
@@ -189,10 +291,17 @@ Examples:
     
     scraper_stats = None
     csv_path = None
+    products = None
+    pipelined = args.pipeline and not args.email_only and not args.scrape_only
     
     # Step 1: Scraping
-    if not args.email_only:
-        csv_path, scraper_stats = run_scraper(limit=args.scrape_limit)
+    if pipelined:
+        # Scraping happens together with emailing in step 2
+        csv_path = get_csv_path()
+        scraper_stats = {'total': 0, 'with_email': 0, 'with_maker': 0, 'with_twitter': 0, 'with_linkedin': 0}
+    elif not args.email_only:
+        csv_path, scraper_stats, products = run_scraper(limit=args.scrape_limit, cdp_endpoint=args.cdp_endpoint,
+                                                        headed=args.headed, parquet=args.parquet)
         print_scraper_stats(scraper_stats)
     else:
         # Use existing CSV
@@ -225,11 +334,13 @@ Examples:
     Mode:        {mode_str}
     CSV:         {csv_path}
     Emails:      {limit_str}
-    Delay:       5 seconds between emails
+    Batches:     up to {BATCH_SIZE} emails per request, paced by Resend rate limits
             """)
             
             if args.test:
                 print(f"    Test Email:  {test_email}")
+            if pipelined:
+                print("    Pipeline:    emails go out while products are still being scraped")
             
             try:
                 response = input("\n    Proceed with sending emails? [y/N]: ").strip().lower()
@@ -241,12 +352,26 @@ Examples:
                 print("\n\n    ⏹️  Cancelled by user.")
                 return
         
-        run_emailer(
-            csv_path=csv_path,
-            limit=args.email_limit,
-            test_mode=args.test,
-            test_email=test_email
-        )
+        if pipelined:
+            scraper_stats = run_pipeline(
+                csv_path=csv_path,
+                scrape_limit=args.scrape_limit,
+                email_limit=args.email_limit,
+                test_mode=args.test,
+                test_email=test_email,
+                cdp_endpoint=args.cdp_endpoint,
+                headed=args.headed,
+                parquet=args.parquet
+            )
+            print_scraper_stats(scraper_stats)
+        else:
+            run_emailer(
+                csv_path=csv_path,
+                limit=args.email_limit,
+                test_mode=args.test,
+                test_email=test_email,
+                products=products
+            )
     
     # Final summary
     print_final_summary(scraper_stats, csv_path)
@@ -3,14 +3,164 @@
 ProductHunt Scraper - Finds today's launches, their websites, and emails
 """
 
+import asyncio
 import csv
+import os
 import re
+import sys
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime
-from dataclasses import dataclass, asdict, field
-from playwright.sync_api import sync_playwright, Page, Browser
+from pathlib import Path
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Route, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 
+MAX_EMAILS_PER_PAGE = 5  # Stop scanning page source after this many usable emails
+MAX_CONTEXTS = 8  # Products processed in parallel, one browser context each
+CACHE_SIZE = 1024  # Entries kept per page-lookup cache
+PRODUCT_TIMEOUT = 25  # Seconds per product before keeping whatever was found
+PARQUET_BATCH_SIZE = 256  # Rows buffered per Parquet record batch
 
-@dataclass
+# Navigation timeouts (ms)
+PH_PAGE_TIMEOUT = 15000
+SITE_TIMEOUT = 8000
+SUBPAGE_TIMEOUT = 5000
+
+# Backoff between retries of navigations that hit a transient network error
+RETRY_DELAYS = (0.5, 1, 2)
+TRANSIENT_ERROR_RE = re.compile(
+    r'net::ERR_(?:CONNECTION_(?:RESET|CLOSED|REFUSED|TIMED_OUT)|TIMED_OUT|NETWORK_CHANGED'
+    r'|EMPTY_RESPONSE|HTTP2_PROTOCOL_ERROR|INTERNET_DISCONNECTED)'
+)
+BROWSER_ARGS = ['--disable-blink-features=AutomationControlled', '--disable-gpu', '--disable-dev-shm-usage']
+# Cookies and local storage kept between runs, so Product Hunt's bot check doesn't re-fire every time
+BROWSER_STATE_PATH = Path(__file__).parent / "data" / "browser-state.json"
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Requests that never carry contact info and only slow page loads down
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+BLOCKED_HOSTS = frozenset({
+    "googletagmanager.com", "google-analytics.com", "doubleclick.net", "segment.io",
+    "hotjar.com", "facebook.net", "sentry.io"
+})
+
+# Social profile links; the matching group number (match.lastindex) picks the field
+SOCIAL_LINK_RE = re.compile(
+    r'(twitter\.com/|x\.com/)'
+    r'|(linkedin\.com/in/)'
+    r'|(github\.com/)'
+    r'|(instagram\.com/|youtube\.com/|facebook\.com/|tiktok\.com/|medium\.com/@|dev\.to/|threads\.net/)'
+)
+SOCIAL_FIELDS = (None, 'twitter', 'linkedin', 'github', 'other_social')
+# GitHub links that point at code rather than a person
+GITHUB_NON_PROFILE_RE = re.compile(r'/(?:issues|pull|blob|tree)')
+
+# Static fetches smaller than this, or an empty JS app shell, are retried in the browser
+STATIC_MIN_BYTES = 1024
+JS_SHELL_RE = re.compile(r'<div id="(?:root|app|__next)">\s*</div>')
+
+# Pages probed in parallel when a website's homepage shows no email
+SUBPAGE_PATHS = ('/contact', '/about', '/support', '/humans.txt', '/robots.txt')
+
+# What to wait for on each kind of page before reading it
+VISIT_LINK_SELECTOR = 'a:has-text("Visit")'
+MAKER_SELECTOR = '[data-test*="comment"], :text("Maker")'
+SOCIAL_LINK_SELECTOR = 'a[href*="twitter.com"], a[href*="x.com"], a[href*="linkedin.com"], a[href*="github.com"]'
+POST_SELECTOR = '[data-test^="post-item-"]'
+
+# Email addresses in page source, and matches that are not real contact emails.
+# The lookbehind only lets a match start at the beginning of a run of
+# local-part characters, so long runs without an '@' (minified JS, inline
+# base64) are scanned once instead of being retried from every position
+EMAIL_RE = re.compile(r'(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+EMAIL_DENY_RE = re.compile(
+    r'example\.com|sentry\.io|wixpress|cloudflare|googleapis|schema\.org|w3\.org'
+    r'|webpack|github|\.png|\.jpg|\.svg'
+)
+
+# In-page scripts that read every matching link in one round trip
+MAILTO_HREFS_JS = """() => Array.from(document.querySelectorAll('a[href^="mailto:"]'), a => a.getAttribute('href'))"""
+PRODUCT_PAGE_JS = """() => ({
+    website: (() => {
+        const visit = Array.from(document.querySelectorAll('a[href]')).find(a =>
+            /visit\\s+website/i.test(a.innerText || '') && !a.getAttribute('href').includes('producthunt.com'));
+        return visit ? visit.getAttribute('href').split('?')[0] : '';
+    })(),
+    hasMaker: /maker/i.test(document.body ? document.body.innerText : ''),
+    profiles: Array.from(
+        document.querySelectorAll('a[href^="/@"], a[href^="https://www.producthunt.com/@"]'),
+        a => [a.getAttribute('href'), a.innerText]
+    )
+})"""
+TODAY_POSTS_JS = """() => {
+    const root = document.querySelector('[data-test="homepage-section-today"]') || document;
+    return Array.from(root.querySelectorAll('[data-test^="post-item-"]'), post => {
+        const id = post.getAttribute('data-test').replace('post-item-', '');
+        const nameEl = document.querySelector(`[data-test="post-name-${id}"]`);
+        const link = post.querySelector("a[href*='/products/']");
+        return {
+            id,
+            name: nameEl ? nameEl.innerText : '',
+            href: link ? link.getAttribute('href') : '',
+            texts: Array.from(post.querySelectorAll('p, span'), el => el.innerText)
+        };
+    });
+}"""
+ALL_HREFS_JS = """() => Array.from(document.querySelectorAll('a[href]'), a => a.getAttribute('href'))"""
+
+CSV_FIELDNAMES = ("date", "source", "name", "tagline", "website", "email", "maker_name",
+                  "maker_profile", "twitter", "linkedin", "github", "other_social", "ph_url")
+# Pulls a Product's CSV row as a tuple, in CSV_FIELDNAMES order
+_CSV_GETTER = attrgetter(*CSV_FIELDNAMES)
+
+
+class LRUCache:
+    """Small least-recently-used cache for page lookups, keyed by normalized URL"""
+    
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+    
+    def get(self, url: str):
+        """Return the cached value for url, or None"""
+        key = normalize_url(url)
+        if key not in self.data:
+            return None
+        self.data.move_to_end(key)
+        return self.data[key]
+    
+    def put(self, url: str, value):
+        key = normalize_url(url)
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL to lowercase host + path, so trivially different links share a cache entry"""
+    parts = urlsplit(url)
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+def strip_url(url: str) -> str:
+    """Drop the query string, fragment and trailing slash from a URL"""
+    return urlsplit(url)._replace(query='', fragment='').geturl().rstrip('/')
+
+
+# Makers often launch several products on the same day, and sibling products
+# can share a website, so each lookup is remembered for the whole run
+_product_page_cache = LRUCache()
+_maker_profile_cache = LRUCache()
+_website_email_cache = LRUCache()
+
+
+@dataclass(slots=True)
 class Product:
     name: str
     tagline: str
@@ -27,135 +177,181 @@ class Product:
     date: str = field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d"))
 
 
-def extract_emails_from_page(page: Page) -> list[str]:
-    """Extract email addresses from page content"""
-    emails = set()
+def is_blocked_host(host: str) -> bool:
+    """Check whether host is, or is a subdomain of, a BLOCKED_HOSTS entry"""
+    parts = (host or '').lower().split('.')
+    return any('.'.join(parts[i:]) in BLOCKED_HOSTS for i in range(len(parts) - 1))
+
+
+async def block_heavy_requests(route: Route):
+    """Abort images, media, fonts, stylesheets and tracker requests; let everything else through"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or is_blocked_host(urlsplit(request.url).hostname):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def new_context(browser: Browser) -> BrowserContext:
+    """Create a browser context for scraping, with heavy requests blocked and saved cookies loaded"""
+    storage_state = BROWSER_STATE_PATH if BROWSER_STATE_PATH.exists() else None
+    context = await browser.new_context(user_agent=USER_AGENT, storage_state=storage_state)
+    await context.route("**/*", block_heavy_requests)
+    return context
+
+
+async def goto(page: Page, url: str, timeout: int):
+    """Navigate to url, retrying with exponential backoff on transient network errors"""
+    for delay in RETRY_DELAYS:
+        try:
+            return await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+        except PlaywrightError as e:
+            # Timeouts and permanent failures (bad host, bad cert) are not retried
+            if isinstance(e, PlaywrightTimeoutError) or not TRANSIENT_ERROR_RE.search(str(e)):
+                raise
+            await asyncio.sleep(delay)
+    return await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+
+
+async def settle(page: Page, selector: str = None, timeout: int = 3000):
+    """Wait until selector appears, or the network goes idle if no selector is given
     
+    Gives up quietly after timeout ms, so the caller reads whatever has loaded
+    """
     try:
-        # Get page content
-        content = page.content()
-        
-        # Find emails using regex
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        found = re.findall(email_pattern, content)
-        
-        for email in found:
-            email = email.lower()
-            # Filter out common non-contact emails
-            if not any(x in email for x in ['example.com', 'sentry.io', 'wixpress', 
-                       'cloudflare', 'googleapis', 'schema.org', 'w3.org', 
-                       'webpack', 'github', '.png', '.jpg', '.svg']):
-                emails.add(email)
-        
-        # Also check for mailto: links
-        mailto_links = page.query_selector_all('a[href^="mailto:"]')
-        for link in mailto_links:
-            href = link.get_attribute('href') or ''
-            if href.startswith('mailto:'):
-                email = href.replace('mailto:', '').split('?')[0].lower()
-                emails.add(email)
-                
-    except Exception:
+        if selector:
+            await page.wait_for_selector(selector, timeout=timeout)
+        else:
+            await page.wait_for_load_state("networkidle", timeout=timeout)
+    except PlaywrightTimeoutError:
         pass
+
+
+async def on_new_page(context: BrowserContext, fetch, url: str, default, *args):
+    """Run fetch(page, url, *args) on a fresh page of context, or return default if there is no url"""
+    if not url:
+        return default
+    
+    page = await context.new_page()
+    try:
+        return await fetch(page, url, *args)
+    finally:
+        await page.close()
+
+
+def find_emails(content: str, mailto_hrefs: list = ()) -> list[str]:
+    """Extract email addresses from page source and mailto: link hrefs, in the order found"""
+    emails = {}
+    
+    # Find emails using regex, stopping early since only the first one is used
+    for match in EMAIL_RE.finditer(content):
+        email = match.group().lower()
+        # Filter out common non-contact emails
+        if not EMAIL_DENY_RE.search(email):
+            emails[email] = None
+            if len(emails) >= MAX_EMAILS_PER_PAGE:
+                break
+    
+    # Also check for mailto: links
+    for href in mailto_hrefs:
+        if href and href.startswith('mailto:'):
+            email = href.replace('mailto:', '').split('?')[0].lower()
+            emails[email] = None
     
     return list(emails)
 
 
-def get_product_website(page: Page, ph_product_url: str) -> str:
-    """Visit ProductHunt product page and find the actual website"""
+async def extract_emails_from_page(page: Page) -> list[str]:
+    """Extract email addresses from page content"""
     try:
-        page.goto(ph_product_url, timeout=30000, wait_until="domcontentloaded")
-        page.wait_for_timeout(2000)
-        
-        # Look for "Visit website" link - it has the actual URL
-        visit_links = page.query_selector_all('a')
-        for link in visit_links:
-            text = (link.inner_text() or '').strip().lower()
-            if 'visit website' in text:
-                href = link.get_attribute('href')
-                if href and 'producthunt.com' not in href:
-                    # Clean the URL - remove ref parameter
-                    clean_url = href.split('?')[0]
-                    return clean_url
-                    
-    except Exception as e:
-        print(f"    ⚠️  Error getting website: {e}")
+        return find_emails(await page.content(), await page.evaluate(MAILTO_HREFS_JS))
+    except Exception:
+        return []
+
+
+async def fetch_static_emails(client: httpx.AsyncClient, url: str, timeout: int = SUBPAGE_TIMEOUT) -> Optional[list[str]]:
+    """Fetch url with a plain HTTP GET and extract emails without a browser
+    
+    Returns None when the page needs a real browser instead: the request
+    failed or was refused, or the HTML is tiny or an empty JavaScript shell
+    """
+    try:
+        response = await client.get(url, timeout=timeout / 1000)
+    except httpx.HTTPError:
+        return None
+    
+    if response.status_code in (404, 410):
+        return []
+    if not response.is_success:
+        return None
     
-    return ""
+    text = response.text
+    # robots.txt, humans.txt and the like have no markup to look at
+    if 'html' not in response.headers.get('content-type', ''):
+        return find_emails(text)
+    
+    mailto_hrefs = [node.attributes.get('href') for node in LexborHTMLParser(text).css('a[href^="mailto:"]')]
+    emails = find_emails(text, mailto_hrefs)
+    if not emails and (len(response.content) < STATIC_MIN_BYTES or JS_SHELL_RE.search(text)):
+        return None
+    return emails
 
 
-def get_maker_info(page: Page, ph_product_url: str) -> dict:
-    """Extract maker info from the first comment on product page
+async def get_product_info(page: Page, ph_product_url: str) -> dict:
+    """Visit ProductHunt product page once and read the actual website and the maker from it
     
-    Returns dict with maker_name, maker_profile, twitter, linkedin, github, other_social
+    Returns dict with website, maker_name, maker_profile
     """
+    cached = _product_page_cache.get(ph_product_url)
+    if cached is not None:
+        return dict(cached)
+    
     result = {
+        'website': '',
         'maker_name': '',
-        'maker_profile': '',
-        'twitter': '',
-        'linkedin': '',
-        'github': '',
-        'other_social': ''
+        'maker_profile': ''
     }
     
     try:
-        # Make sure we're on the product page
-        if page.url != ph_product_url:
-            page.goto(ph_product_url, timeout=30000, wait_until="domcontentloaded")
-            page.wait_for_timeout(2000)
+        await goto(page, ph_product_url, PH_PAGE_TIMEOUT)
+        await settle(page, VISIT_LINK_SELECTOR, timeout=5000)
+        # Comments can render after the rest of the page
+        await settle(page, MAKER_SELECTOR, timeout=5000)
         
-        # Find the first comment with "Maker" badge
-        # The maker badge appears near the commenter's name
-        maker_elements = page.query_selector_all('text=Maker')
+        info = await page.evaluate(PRODUCT_PAGE_JS)
         
-        if maker_elements:
-            # Find the parent container and look for the maker's profile link
-            for maker_badge in maker_elements:
-                try:
-                    # Navigate up to find the comment container
-                    parent = maker_badge.evaluate_handle('el => el.closest("div")')
-                    if not parent:
-                        continue
-                    
-                    # Look for the maker's profile link nearby
-                    # The structure is usually: name link followed by Maker badge
-                    profile_links = page.query_selector_all('a[href^="/@"], a[href^="https://www.producthunt.com/@"]')
-                    
-                    for link in profile_links:
-                        href = link.get_attribute('href') or ''
-                        if '/@' in href:
-                            # Get maker name
-                            name = link.inner_text().strip()
-                            if name and len(name) > 1 and not name.startswith('Image'):
-                                result['maker_name'] = name
-                                # Get full profile URL
-                                if href.startswith('/'):
-                                    result['maker_profile'] = f"https://www.producthunt.com{href}"
-                                else:
-                                    result['maker_profile'] = href
-                                break
-                    
-                    if result['maker_profile']:
-                        break
-                except Exception:
-                    continue
+        # The first "Visit website" link off Product Hunt, without its ref parameter
+        result['website'] = info['website']
+        
+        # Only look for a maker if a comment carries the "Maker" badge
+        if info['hasMaker']:
+            # The structure is usually: name link followed by Maker badge
+            for href, name in info['profiles']:
+                href = href or ''
+                name = (name or '').strip()
+                if '/@' in href and len(name) > 1 and not name.startswith('Image'):
+                    result['maker_name'] = name
+                    # Get full profile URL
+                    if href.startswith('/'):
+                        result['maker_profile'] = f"https://www.producthunt.com{href}"
+                    else:
+                        result['maker_profile'] = href
+                    break
+        
+        _product_page_cache.put(ph_product_url, dict(result))
         
-        # If we found a maker profile, visit it to get social links
-        if result['maker_profile']:
-            print(f"    → Found maker: {result['maker_name']}")
-            print(f"    → Visiting maker profile...")
-            
-            social_links = get_maker_social_links(page, result['maker_profile'])
-            result.update(social_links)
-            
     except Exception as e:
-        print(f"    ⚠️  Error getting maker info: {e}")
+        print(f"    ⚠️  Error reading product page: {e}")
     
     return result
 
 
-def get_maker_social_links(page: Page, maker_profile_url: str) -> dict:
+async def get_maker_social_links(page: Page, maker_profile_url: str) -> dict:
     """Visit maker profile page and extract social links"""
+    cached = _maker_profile_cache.get(maker_profile_url)
+    if cached is not None:
+        return dict(cached)
+    
     result = {
         'twitter': '',
         'linkedin': '',
@@ -164,46 +360,39 @@ def get_maker_social_links(page: Page, maker_profile_url: str) -> dict:
     }
     
     try:
-        page.goto(maker_profile_url, timeout=30000, wait_until="domcontentloaded")
-        page.wait_for_timeout(2000)
+        await goto(page, maker_profile_url, PH_PAGE_TIMEOUT)
+        await settle(page, SOCIAL_LINK_SELECTOR, timeout=3000)
         
         # Find all links on the page
-        all_links = page.query_selector_all('a[href]')
         other_socials = []
         
-        for link in all_links:
-            href = (link.get_attribute('href') or '').lower()
+        for raw_href in await page.evaluate(ALL_HREFS_JS):
+            raw_href = raw_href or ''
+            href = raw_href.lower()
             
-            # Twitter/X
-            if ('twitter.com/' in href or 'x.com/' in href) and not result['twitter']:
-                if '/ProductHunt' not in href and '/producthunt' not in href:
-                    result['twitter'] = link.get_attribute('href')
+            match = SOCIAL_LINK_RE.search(href)
+            if not match:
+                continue
+            field_name = SOCIAL_FIELDS[match.lastindex]
             
-            # LinkedIn
-            elif 'linkedin.com/in/' in href and not result['linkedin']:
-                result['linkedin'] = link.get_attribute('href')
+            # Other social links (Instagram, YouTube, personal website, etc.)
+            if field_name == 'other_social':
+                other_socials.append(raw_href)
             
-            # GitHub
-            elif 'github.com/' in href and not result['github']:
+            # Twitter/X, LinkedIn, GitHub: keep the first personal one
+            elif not result[field_name]:
+                if field_name == 'twitter' and '/producthunt' in href:
+                    continue
                 # Exclude common non-personal github links
-                if not any(x in href for x in ['/issues', '/pull', '/blob', '/tree']):
-                    result['github'] = link.get_attribute('href')
-            
-            # Other social links (Instagram, YouTube, personal website, etc.)
-            elif any(social in href for social in ['instagram.com/', 'youtube.com/', 'facebook.com/', 
-                     'tiktok.com/', 'medium.com/@', 'dev.to/', 'threads.net/']):
-                other_socials.append(link.get_attribute('href'))
+                if field_name == 'github' and GITHUB_NON_PROFILE_RE.search(href):
+                    continue
+                result[field_name] = raw_href
         
         # Join other social links
         if other_socials:
             result['other_social'] = ' | '.join(other_socials[:3])  # Limit to 3
-            
-        # Log what we found
-        found = [k for k, v in result.items() if v]
-        if found:
-            print(f"    → Social links: {', '.join(found)}")
-        else:
-            print(f"    → No social links found")
+        
+        _maker_profile_cache.put(maker_profile_url, dict(result))
             
     except Exception as e:
         print(f"    ⚠️  Error getting social links: {e}")
@@ -211,31 +400,67 @@ def get_maker_social_links(page: Page, maker_profile_url: str) -> dict:
     return result
 
 
-def get_email_from_website(page: Page, website_url: str) -> str:
-    """Visit website and find email address"""
+async def probe_for_emails(page: Page, url: str, timeout: int = SUBPAGE_TIMEOUT) -> list[str]:
+    """Load one page in the browser and return the emails on it"""
+    await goto(page, url, timeout)
+    await settle(page, timeout=3000)
+    return await extract_emails_from_page(page)
+
+
+async def emails_at(context: BrowserContext, client: httpx.AsyncClient, url: str, timeout: int = SUBPAGE_TIMEOUT) -> list[str]:
+    """Find emails on one page, fetching it statically first and in the browser only if needed"""
+    emails = await fetch_static_emails(client, url, timeout)
+    if emails is None:
+        emails = await on_new_page(context, probe_for_emails, url, [], timeout)
+    return emails
+
+
+async def first_emails(context: BrowserContext, client: httpx.AsyncClient, urls: list[str]) -> list[str]:
+    """Probe urls in parallel and return the first non-empty result
+    
+    The remaining probes are cancelled as soon as one finds an email
+    """
+    tasks = [asyncio.create_task(emails_at(context, client, url)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                emails = await next_done
+            except Exception:
+                continue
+            if emails:
+                return emails
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def get_email_from_website(context: BrowserContext, client: httpx.AsyncClient, website_url: str) -> str:
+    """Visit website and find email address
+    
+    Pages are fetched with plain HTTP first; the browser is only used for
+    pages that need JavaScript to show their content
+    """
     if not website_url:
         return ""
     
+    cached = _website_email_cache.get(website_url)
+    if cached is not None:
+        return cached
+    
     emails = []
     
     try:
         # Visit main page
-        page.goto(website_url, timeout=20000)
-        page.wait_for_timeout(2000)
-        emails.extend(extract_emails_from_page(page))
+        emails = await emails_at(context, client, website_url, timeout=SITE_TIMEOUT)
         
         # If no emails found, try common pages
         if not emails:
             base_url = website_url.rstrip('/')
-            for path in ['/contact', '/about', '/support']:
-                try:
-                    page.goto(f"{base_url}{path}", timeout=10000)
-                    page.wait_for_timeout(1000)
-                    emails.extend(extract_emails_from_page(page))
-                    if emails:
-                        break
-                except Exception:
-                    continue
+            emails = await first_emails(context, client, [f"{base_url}{path}" for path in SUBPAGE_PATHS])
+        
+        _website_email_cache.put(website_url, emails[0] if emails else "")
                     
     except Exception as e:
         print(f"    ⚠️  Error visiting website: {e}")
@@ -244,181 +469,359 @@ def get_email_from_website(page: Page, website_url: str) -> str:
     return emails[0] if emails else ""
 
 
-def scrape_producthunt(limit: int = None) -> list[Product]:
-    """Scrape today's products from ProductHunt homepage
+async def save_browser_state(context: BrowserContext):
+    """Save the context's cookies and local storage for the next run"""
+    try:
+        BROWSER_STATE_PATH.parent.mkdir(exist_ok=True)
+        await context.storage_state(path=str(BROWSER_STATE_PATH))
+    except Exception as e:
+        print(f"  ⚠️  Could not save browser state: {e}")
+
+
+async def get_today_products(page: Page) -> list[dict]:
+    """Collect name, tagline and PH URL of today's launches from the homepage"""
+    # Step 1: Load ProductHunt homepage
+    print("  📡 Loading ProductHunt homepage...")
+    await goto(page, "https://www.producthunt.com", 60000)
+    await settle(page, POST_SELECTOR, timeout=10000)
     
-    Args:
-        limit: Optional limit on number of products to process (for testing)
-    """
-    products = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=False,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-        page = context.new_page()
-        
-        # Step 1: Load ProductHunt homepage
-        print("  📡 Loading ProductHunt homepage...")
-        page.goto("https://www.producthunt.com", timeout=60000)
-        page.wait_for_timeout(5000)
-        
-        # Step 2: Click "See all of today's products" to load all today's products
-        print("  🔘 Clicking 'See all of today's products'...")
-        try:
-            btn = page.query_selector('button:has-text("See all of today")')
-            if btn:
-                btn.click()
-                # Wait for products to load (takes ~4 seconds)
-                page.wait_for_timeout(5000)
-                print("  ✅ Loaded all today's products")
-            else:
-                print("  ⚠️  'See all' button not found")
-        except Exception as e:
-            print(f"  ⚠️  Could not click 'See all': {e}")
-        
-        # Step 3: Get only today's products from the today section
-        today_section = page.query_selector('[data-test="homepage-section-today"]')
-        
-        if today_section:
-            posts = today_section.query_selector_all('[data-test^="post-item-"]')
+    # Step 2: Click "See all of today's products" to load all today's products
+    print("  🔘 Clicking 'See all of today's products'...")
+    try:
+        btn = await page.query_selector('button:has-text("See all of today")')
+        if btn:
+            await btn.click()
+            # Wait for the extra products to finish loading (takes ~4 seconds)
+            await settle(page, timeout=8000)
+            print("  ✅ Loaded all today's products")
         else:
-            posts = page.query_selector_all('[data-test^="post-item-"]')
-        
-        print(f"  ℹ️  Found {len(posts)} products launching today")
-        
-        # Collect product info first (deduplicate by post_id)
-        product_data = []
-        seen_ids = set()
-        
-        for post in posts:
-            try:
-                test_id = post.get_attribute("data-test")
-                post_id = test_id.replace("post-item-", "")
-                
-                if post_id in seen_ids:
-                    continue
-                seen_ids.add(post_id)
-                
-                # Get product name
-                name_el = page.query_selector(f'[data-test="post-name-{post_id}"]')
-                name = name_el.inner_text().strip() if name_el else ""
-                
-                if not name:
-                    continue
-                
-                # Clean up numbered names like "333. ProductName"
-                if '. ' in name[:6] and name.split('. ')[0].isdigit():
-                    name = name.split('. ', 1)[1]
-                
-                # Get ProductHunt product page link
-                link = post.query_selector("a[href*='/products/']")
-                href = link.get_attribute("href") if link else ""
-                ph_url = f"https://www.producthunt.com{href}" if href and href.startswith("/") else href
-                
-                # Get tagline
-                tagline = ""
-                texts = post.query_selector_all("p, span")
-                for t in texts:
-                    txt = t.inner_text().strip()
-                    if txt and not txt.isdigit() and len(txt) > 10 and txt != name and not txt.startswith(name):
-                        tagline = txt
-                        break
-                
-                product_data.append({
-                    'name': name,
-                    'tagline': tagline,
-                    'ph_url': ph_url
-                })
-                
-            except Exception:
+            print("  ⚠️  'See all' button not found")
+    except Exception as e:
+        print(f"  ⚠️  Could not click 'See all': {e}")
+    
+    # Step 3: Read today's products (from the today section, if there is one) in one go
+    posts = await page.evaluate(TODAY_POSTS_JS)
+    
+    print(f"  ℹ️  Found {len(posts)} products launching today")
+    
+    # Collect product info first (deduplicate by post_id)
+    product_data = []
+    seen_ids = set()
+    
+    for post in posts:
+        try:
+            post_id = post['id']
+            
+            if post_id in seen_ids:
                 continue
-        
-        print(f"\n  🔍 Processing {len(product_data)} unique products...")
-        
-        # Apply limit if specified
-        if limit and limit < len(product_data):
-            print(f"  ⚠️  Limiting to first {limit} products")
-            product_data = product_data[:limit]
-        
-        # Step 4: Visit each product page to get website, then get email
-        for i, data in enumerate(product_data):
-            print(f"\n  [{i+1}/{len(product_data)}] {data['name']}")
+            seen_ids.add(post_id)
             
-            # Get actual website from PH product page
-            print(f"    → Getting website...")
-            website = get_product_website(page, data['ph_url'])
-            print(f"    → Website: {website or 'Not found'}")
+            # Get product name
+            name = (post['name'] or "").strip()
             
-            # Get maker info (name, profile, social links)
-            print(f"    → Getting maker info...")
-            maker_info = get_maker_info(page, data['ph_url'])
+            if not name:
+                continue
             
-            # Get email from website
-            email = ""
-            if website:
-                print(f"    → Finding email...")
-                email = get_email_from_website(page, website)
-                print(f"    → Email: {email or 'Not found'}")
+            # Clean up numbered names like "333. ProductName"
+            if '. ' in name[:6] and name.split('. ')[0].isdigit():
+                name = name.split('. ', 1)[1]
             
-            products.append(Product(
-                name=data['name'],
-                tagline=data['tagline'],
-                ph_url=data['ph_url'],
-                website=website,
-                email=email,
-                maker_name=maker_info['maker_name'],
-                maker_profile=maker_info['maker_profile'],
-                twitter=maker_info['twitter'],
-                linkedin=maker_info['linkedin'],
-                github=maker_info['github'],
-                other_social=maker_info['other_social']
-            ))
-        
-        browser.close()
+            # Get ProductHunt product page link
+            href = post['href'] or ""
+            ph_url = f"https://www.producthunt.com{href}" if href and href.startswith("/") else href
+            # Tracking parameters would only make the same page look like a new one
+            ph_url = strip_url(ph_url) if ph_url else ""
+            
+            # Get tagline
+            tagline = ""
+            for txt in post['texts']:
+                txt = (txt or "").strip()
+                if txt and not txt.isdigit() and len(txt) > 10 and txt != name and not txt.startswith(name):
+                    tagline = txt
+                    break
+            
+            product_data.append({
+                'name': name,
+                'tagline': tagline,
+                'ph_url': ph_url
+            })
+            
+        except Exception:
+            continue
     
-    return products
+    return product_data
 
 
-def save_to_csv(products: list[Product], filename: str = None):
-    """Save products to CSV file in data directory"""
-    from pathlib import Path
+async def fill_product(context: BrowserContext, client: httpx.AsyncClient, product: Product):
+    """Fill in website, maker info and email on product as each becomes known
+    
+    The product page is read once; the maker profile and the website are
+    then visited in parallel on two pages of the same context
+    """
+    # Get actual website and maker from PH product page
+    info = await on_new_page(context, get_product_info, product.ph_url, {})
+    product.website = info.get('website', '')
+    product.maker_name = info.get('maker_name', '')
+    product.maker_profile = info.get('maker_profile', '')
     
-    # Create data directory if it doesn't exist
-    data_dir = Path(__file__).parent / "data"
-    data_dir.mkdir(exist_ok=True)
+    async def fill_social_links():
+        social_links = await on_new_page(context, get_maker_social_links, product.maker_profile, {})
+        for key, value in social_links.items():
+            setattr(product, key, value)
     
-    if not filename:
-        filename = f"launches-{datetime.now().strftime('%Y-%m-%d')}.csv"
+    async def fill_email():
+        product.email = await get_email_from_website(context, client, product.website)
     
-    filepath = data_dir / filename
+    # Get maker social links and email from website at the same time
+    await asyncio.gather(fill_social_links(), fill_email())
+
+
+async def process_product(pool: asyncio.Queue, client: httpx.AsyncClient, data: dict, number: str) -> Product:
+    """Find website, maker info and email for one product, using a browser context from the pool
     
-    if not products:
-        print("  ⚠️  No products to save")
-        return
+    A product gets at most PRODUCT_TIMEOUT seconds; after that it is returned
+    with whatever was found so far.
+    Output is printed as one block once the product is done, so parallel
+    products don't interleave their lines
+    """
+    product = Product(
+        name=data['name'],
+        tagline=data['tagline'],
+        ph_url=data['ph_url'],
+        website="",
+        email=""
+    )
+    timed_out = False
     
-    fieldnames = ["date", "source", "name", "tagline", "website", "email", "maker_name", 
-                  "maker_profile", "twitter", "linkedin", "github", "other_social", "ph_url"]
+    context = await pool.get()
+    try:
+        await asyncio.wait_for(fill_product(context, client, product), timeout=PRODUCT_TIMEOUT)
+    except asyncio.TimeoutError:
+        timed_out = True
+    finally:
+        pool.put_nowait(context)
     
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for product in products:
-            row = asdict(product)
-            writer.writerow({k: row[k] for k in fieldnames})
+    socials = [k for k in ('twitter', 'linkedin', 'github', 'other_social') if getattr(product, k)]
+    print(f"\n  [{number}] {product.name}")
+    print(f"    → Website: {product.website or 'Not found'}")
+    print(f"    → Maker: {product.maker_name or 'Not found'}")
+    if product.maker_profile:
+        print(f"    → Social links: {', '.join(socials) or 'None found'}")
+    if product.website:
+        print(f"    → Email: {product.email or 'Not found'}")
+    if timed_out:
+        print(f"    ⏱️  Gave up after {PRODUCT_TIMEOUT}s, keeping what was found")
     
-    print(f"  ✅ Saved {len(products)} products to {filepath}")
+    return product
+
+
+@asynccontextmanager
+async def producthunt_session(limit: int = None, cdp_endpoint: str = None,
+                              headed: bool = False) -> AsyncIterator[tuple[asyncio.Queue, httpx.AsyncClient, list[dict]]]:
+    """Open the browser, list today's products and yield (context_pool, http_client, product_data)
+    
+    The pool is an asyncio.Queue of MAX_CONTEXTS browser contexts; each
+    product borrows one while it is processed, which also caps concurrency.
+    The HTTP client fetches static pages of product websites
+    
+    The browser is headless unless headed is set. With cdp_endpoint, connect
+    to an already running Chromium instead of launching one, so several
+    scraper runs can share a single browser
+    """
+    async with async_playwright() as p, httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=8,
+        headers={'User-Agent': USER_AGENT}
+    ) as client:
+        if cdp_endpoint:
+            print(f"  🔌 Connecting to browser at {cdp_endpoint}...")
+            browser = await p.chromium.connect_over_cdp(cdp_endpoint)
+        else:
+            # The full chromium channel runs Chrome's new headless mode
+            browser = await p.chromium.launch(
+                headless=not headed,
+                channel="chromium",
+                args=BROWSER_ARGS
+            )
+        try:
+            pool = asyncio.Queue()
+            for _ in range(MAX_CONTEXTS):
+                pool.put_nowait(await new_context(browser))
+            
+            # Read the homepage with one of the pooled contexts
+            context = await pool.get()
+            page = await context.new_page()
+            try:
+                product_data = await get_today_products(page)
+                await save_browser_state(context)
+            finally:
+                await page.close()
+                pool.put_nowait(context)
+            
+            print(f"\n  🔍 Processing {len(product_data)} unique products...")
+            
+            # Apply limit if specified
+            if limit and limit < len(product_data):
+                print(f"  ⚠️  Limiting to first {limit} products")
+                product_data = product_data[:limit]
+            
+            yield pool, client, product_data
+        finally:
+            # For a shared browser this only closes our contexts and disconnects
+            await browser.close()
+
+
+async def iter_producthunt(limit: int = None, cdp_endpoint: str = None, headed: bool = False) -> AsyncIterator[Product]:
+    """Scrape today's products from ProductHunt homepage, yielding each one as soon as it is done
+    
+    Products are processed in parallel, so they arrive in completion order
+    
+    Args:
+        limit: Optional limit on number of products to process (for testing)
+        cdp_endpoint: Optional CDP URL of a running browser to use instead of launching one
+        headed: Show the browser window instead of running headless
+    """
+    async with producthunt_session(limit, cdp_endpoint, headed) as (pool, client, product_data):
+        total = len(product_data)
+        tasks = [
+            asyncio.create_task(process_product(pool, client, data, f"{i+1}/{total}"))
+            for i, data in enumerate(product_data)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Let cancelled products close their pages before the browser goes away
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def product_to_dict(product: Product) -> dict:
+    """Return a product's CSV columns as a dict, without asdict()'s deep copy"""
+    return dict(zip(CSV_FIELDNAMES, _CSV_GETTER(product)))
+
+
+class ProductWriter:
+    """Write products to CSV, and optionally Parquet, as soon as each one is scraped
+    
+    Rows go to a .partial file that is flushed after every product and renamed
+    into place when the run finishes, so an aborted scrape keeps what it found
+    without clobbering an earlier complete file
+    """
+    
+    def __init__(self, filename: str = None, parquet: bool = False):
+        data_dir = Path(__file__).parent / "data"
+        data_dir.mkdir(exist_ok=True)
+        
+        if not filename:
+            filename = f"launches-{datetime.now().strftime('%Y-%m-%d')}.csv"
+        
+        self.filepath = data_dir / filename
+        self.count = 0
+        self._parquet = ParquetBatches(self.filepath.with_suffix(".parquet")) if parquet else None
+        self._file = open(f"{self.filepath}.partial", "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_FIELDNAMES)
+    
+    def write(self, product: Product):
+        """Append one product and flush it to disk"""
+        row = _CSV_GETTER(product)
+        self._writer.writerow(row)
+        self._file.flush()
+        if self._parquet:
+            self._parquet.append(row)
+        self.count += 1
+    
+    def close(self, complete: bool = True):
+        """Finish the output files; incomplete runs stay behind as .partial"""
+        self._file.close()
+        
+        partial_path = f"{self.filepath}.partial"
+        if not self.count:
+            os.remove(partial_path)
+            print("  ⚠️  No products to save")
+        elif complete:
+            os.replace(partial_path, self.filepath)
+            print(f"  ✅ Saved {self.count} products to {self.filepath}")
+        else:
+            print(f"  ⚠️  Run stopped early, kept {self.count} products in {partial_path}")
+        
+        if self._parquet:
+            self._parquet.close(complete)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+
+class ParquetBatches:
+    """Buffer product rows column by column and write them to Parquet one record batch at a time"""
+    
+    def __init__(self, path: Path, batch_size: int = PARQUET_BATCH_SIZE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("❌ Please install pyarrow for Parquet output: pip3 install pyarrow")
+            sys.exit(1)
+        
+        self._pa = pa
+        self.path = path
+        self.batch_size = batch_size
+        self._schema = pa.schema([(name, pa.string()) for name in CSV_FIELDNAMES])
+        self._writer = pq.ParquetWriter(f"{path}.partial", self._schema)
+        self._columns = tuple([] for _ in CSV_FIELDNAMES)
+        self.rows = 0
+    
+    def append(self, row: tuple):
+        """Add one row, writing out a record batch whenever the buffer is full"""
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self.rows += 1
+        if len(self._columns[0]) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Write the buffered rows as one record batch"""
+        if not self._columns[0]:
+            return
+        arrays = [self._pa.array(column, self._pa.string()) for column in self._columns]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+        for column in self._columns:
+            column.clear()
+    
+    def close(self, complete: bool = True):
+        """Write what is left and close the file, same .partial rules as ProductWriter"""
+        self.flush()
+        self._writer.close()
+        partial_path = f"{self.path}.partial"
+        if not self.rows:
+            os.remove(partial_path)
+        elif complete:
+            os.replace(partial_path, self.path)
+            print(f"  ✅ Saved {self.rows} products to {self.path}")
+        else:
+            print(f"  ⚠️  Run stopped early, kept {self.rows} Parquet rows in {partial_path}")
 
 
 def main():
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Scrape today\'s Product Hunt launches')
+    parser.add_argument('limit', nargs='?', type=int, default=None,
+                        help='Maximum number of products to process')
+    parser.add_argument('--cdp-endpoint', default=None,
+                        help='Use a running Chromium at this CDP URL (e.g. http://localhost:9222) instead of launching one')
+    parser.add_argument('--headed', action='store_true',
+                        help='Show the browser window (useful when Product Hunt asks for a human check)')
+    parser.add_argument('--parquet', action='store_true',
+                        help='Also write a Parquet file next to the CSV (needs pyarrow)')
+    args = parser.parse_args()
     
-    # Optional limit from command line: python scraper.py 10
-    limit = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    limit = args.limit
     
     print("\n🚀 ProductHunt Scraper")
     print("=" * 50)
@@ -426,31 +829,31 @@ def main():
         print(f"⚠️  Limiting to first {limit} products")
     
     print("\n📥 Scraping ProductHunt...")
+    stats = {'email': 0, 'maker_name': 0, 'twitter': 0, 'linkedin': 0}
+    
+    async def scrape(writer: ProductWriter):
+        # Each product is on disk as soon as it is done; only the counts stay in memory
+        async for product in iter_producthunt(limit=limit, cdp_endpoint=args.cdp_endpoint, headed=args.headed):
+            writer.write(product)
+            for key in stats:
+                if getattr(product, key):
+                    stats[key] += 1
+    
+    writer = ProductWriter(parquet=args.parquet)
     try:
-        products = scrape_producthunt(limit=limit)
-        print(f"\n  ✅ Found {len(products)} products")
-        
-        # Count stats
-        with_email = sum(1 for p in products if p.email)
-        with_maker = sum(1 for p in products if p.maker_name)
-        with_twitter = sum(1 for p in products if p.twitter)
-        with_linkedin = sum(1 for p in products if p.linkedin)
-        
-        print(f"  📧 {with_email} products have email addresses")
-        print(f"  👤 {with_maker} products have maker info")
-        print(f"  🐦 {with_twitter} makers have Twitter/X")
-        print(f"  💼 {with_linkedin} makers have LinkedIn")
+        with writer:
+            asyncio.run(scrape(writer))
+        print(f"\n  ✅ Found {writer.count} products")
+        print(f"  📧 {stats['email']} products have email addresses")
+        print(f"  👤 {stats['maker_name']} products have maker info")
+        print(f"  🐦 {stats['twitter']} makers have Twitter/X")
+        print(f"  💼 {stats['linkedin']} makers have LinkedIn")
         
     except Exception as e:
         print(f"  ❌ Error: {e}")
-        products = []
-    
-    # Save results
-    print("\n💾 Saving results...")
-    save_to_csv(products)
     
     print("\n" + "=" * 50)
-    print(f"✅ Done! Total: {len(products)} products")
+    print(f"✅ Done! Total: {writer.count} products")
 
 
 if __name__ == "__main__":